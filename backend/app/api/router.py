@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 
+from .routes.jobs import router as jobs_router
 from .routes.policy import router as policy_router
 from .routes.simulation import router as simulation_router
 from .routes.telemetry import dashboard_router, rocket_router
@@ -11,4 +12,5 @@ api_router.include_router(policy_router)
 api_router.include_router(simulation_router)
 api_router.include_router(rocket_router)
 api_router.include_router(dashboard_router)
+api_router.include_router(jobs_router)
 
@@ -0,0 +1,119 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field, field_validator
+
+from ...core.jobs import get_job_manager, load_job_result
+from ...core.lander import check_observation_sizes, episode_summary
+from ...core.runtime import list_runs, resolve_run_model_path
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+class EvaluationJobRequest(BaseModel):
+    runs: list[str] | None = Field(
+        default=None,
+        description="Run folder names to evaluate; all runs when omitted",
+    )
+    n_seeds: int = Field(default=100, ge=1, le=10_000)
+    seed_start: int = 0
+    observations: list[list[float]] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=10_000,
+        description="Optional sweep of custom starting observations, one episode each",
+    )
+    max_steps: int = Field(default=1000, ge=100, le=1000)
+    deterministic: bool = True
+
+    @field_validator("observations")
+    @classmethod
+    def validate_observations(cls, value: list[list[float]] | None) -> list[list[float]] | None:
+        return check_observation_sizes(value) if value is not None else None
+
+
+@router.post("", status_code=202)
+def submit_job(req: EvaluationJobRequest) -> dict[str, Any]:
+    available = list_runs()
+    with_model = [run for run in available if resolve_run_model_path(run).exists()]
+    if req.runs:
+        runs = list(dict.fromkeys(req.runs))
+        unknown = sorted(set(runs) - set(available))
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown runs: {', '.join(unknown)}")
+        missing_model = sorted(set(runs) - set(with_model))
+        if missing_model:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Runs without a model file: {', '.join(missing_model)}",
+            )
+    else:
+        # "All runs" only covers run folders that actually contain a model.
+        runs = with_model
+    if not runs:
+        raise HTTPException(status_code=404, detail="No run directories with a model found")
+
+    # Observation sweeps run one episode per observation; seed only drives terrain.
+    if req.observations is not None:
+        kind = "observations"
+        n_episodes = len(req.observations)
+    else:
+        kind = "seeds"
+        n_episodes = req.n_seeds
+    spec = {
+        "seeds": list(range(req.seed_start, req.seed_start + n_episodes)),
+        "observations": req.observations,
+        "max_steps": req.max_steps,
+        "deterministic": req.deterministic,
+    }
+    job_id = get_job_manager().submit(kind, runs, spec)
+    return {
+        "job_id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "runs": runs,
+        "episodes_per_run": n_episodes,
+    }
+
+
+@router.get("")
+def list_jobs(limit: int = Query(default=50, ge=1, le=500)) -> dict[str, Any]:
+    return {"jobs": get_job_manager().list(limit)}
+
+
+@router.get("/{job_id}")
+def job_status(job_id: str) -> dict[str, Any]:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return job
+
+
+@router.get("/{job_id}/result")
+def job_result(job_id: str, success_threshold: float = 200.0) -> dict[str, Any]:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+
+    # Completed units are returned even while others are pending or have failed.
+    results: dict[str, Any] = {}
+    incomplete: list[dict[str, Any]] = []
+    for unit in job["units"]:
+        data = load_job_result(unit["run"], job_id) if unit["status"] == "completed" else None
+        if data is None:
+            incomplete.append(unit)
+            continue
+        results[unit["run"]] = {
+            **episode_summary(data["rewards"], data["lengths"], success_threshold),
+            "seeds": data["seeds"].tolist(),
+            "rewards": data["rewards"].tolist(),
+            "lengths": data["lengths"].tolist(),
+        }
+
+    return {
+        "job_id": job_id,
+        "kind": job["kind"],
+        "status": job["status"],
+        "results": results,
+        "incomplete": incomplete,
+    }
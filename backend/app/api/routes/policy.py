@@ -1,11 +1,15 @@
-from typing import Any
+import time
+from typing import Any, Literal
 
 import gymnasium as gym
 import numpy as np
 import torch
-from fastapi import APIRouter
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Request, Response
+from pydantic import BaseModel, Field, field_validator
 
+from ...core.encoding import encode_response
+from ...core.lander import check_observation_sizes
+from ...core.rollout import FastRollout
 from ...core.runtime import get_model, require_run_model_or_503
 from ...core.settings import MODEL_PATH
 
@@ -17,6 +21,8 @@ class RolloutRequest(BaseModel):
     seed: int | None = 42
     max_steps: int = Field(default=600, ge=100, le=1000)
     deterministic: bool = True
+    # "fast" steps the raw env with a compiled policy; "gym" keeps the wrapped reference loop.
+    engine: Literal["fast", "gym"] = "fast"
 
 
 class Observation(BaseModel):
@@ -24,6 +30,16 @@ class Observation(BaseModel):
     observation: list[float]
 
 
+class ObservationBatch(BaseModel):
+    run: str | None = None
+    observations: list[list[float]] = Field(..., min_length=1, max_length=4096)
+
+    @field_validator("observations")
+    @classmethod
+    def validate_observations(cls, value: list[list[float]]) -> list[list[float]]:
+        return check_observation_sizes(value)
+
+
 @router.get("")
 def health() -> dict[str, Any]:
     model_loaded = True
@@ -66,10 +82,47 @@ def predict(obs: Observation) -> dict[str, Any]:
     }
 
 
+@router.post("/predict/batch")
+def predict_batch(batch: ObservationBatch, request: Request) -> Response:
+    model = require_run_model_or_503(batch.run)
+    states = np.asarray(batch.observations, dtype=np.float32)
+    tensor_states = torch.as_tensor(states, device=model.device)
+    # Actor runs once: deterministic SB3 actions are the argmax of these probabilities.
+    with torch.no_grad():
+        probs_tensor = model.policy.get_distribution(tensor_states).distribution.probs
+        actions = probs_tensor.argmax(dim=-1).cpu().numpy()
+        probs = probs_tensor.cpu().numpy()
+        values = model.policy.predict_values(tensor_states).reshape(-1).cpu().numpy()
+
+    return encode_response(
+        request,
+        {
+            "actions": actions,
+            "value_estimates": values,
+            "probabilities": probs,
+            "count": int(len(states)),
+        },
+    )
+
+
 @router.post("/rollout")
 def rollout(req: RolloutRequest) -> dict[str, Any]:
     model = require_run_model_or_503(req.run)
+    if req.engine == "fast":
+        engine = FastRollout(model)
+        try:
+            result = engine.run(req.seed, req.max_steps, deterministic=req.deterministic)
+        finally:
+            engine.close()
+        return {
+            "total_reward": result["total_reward"],
+            "steps": result["steps"],
+            "engine": req.engine,
+            "steps_per_sec": result["steps_per_sec"],
+        }
+
     env = gym.make("LunarLander-v3")
+    started = time.perf_counter()
     obs, _ = env.reset(seed=req.seed)
     total_reward = 0.0
     steps = 0
@@ -83,5 +136,11 @@ def rollout(req: RolloutRequest) -> dict[str, Any]:
         if terminated or truncated:
             break
 
+    elapsed = time.perf_counter() - started
     env.close()
-    return {"total_reward": total_reward, "steps": steps}
+    return {
+        "total_reward": total_reward,
+        "steps": steps,
+        "engine": req.engine,
+        "steps_per_sec": steps / elapsed if elapsed > 0 else None,
+    }
@@ -1,14 +1,14 @@
-import base64
 import io
 from typing import Any
 
 import gymnasium as gym
 import numpy as np
-from fastapi import APIRouter, HTTPException
-from gymnasium.envs.box2d import lunar_lander as ll
+from fastapi import APIRouter, HTTPException, Request, Response
 from PIL import Image
 from pydantic import BaseModel, Field, field_validator
 
+from ...core.encoding import encode_response
+from ...core.lander import apply_observation_override
 from ...core.runtime import require_run_model_or_503
 
 router = APIRouter(prefix="/interface", tags=["interface"])
@@ -40,14 +40,14 @@ class TestRocketRequest(BaseModel):
         return value
 
 
-def _frame_to_base64_png(frame: Any) -> str:
+def _frame_to_png(frame: Any) -> bytes:
     image = Image.fromarray(frame)
     buf = io.BytesIO()
     image.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode("utf-8")
+    return buf.getvalue()
 
 
-def _frames_to_base64_gif(frames: list[Any], max_frames: int = 120) -> str | None:
+def _frames_to_gif(frames: list[Any], max_frames: int = 120) -> bytes | None:
     if not frames:
         return None
     # Down-sample long trajectories to bound GIF size and response payload time.
@@ -64,57 +64,7 @@ def _frames_to_base64_gif(frames: list[Any], max_frames: int = 120) -> str | Non
         loop=0,
         optimize=False,
     )
-    return base64.b64encode(buf.getvalue()).decode("utf-8")
-
-
-def _apply_observation_override(env: gym.Env, observation: list[float]) -> np.ndarray:
-    """Map normalized LunarLander observation values back to physical lander state."""
-    uw = env.unwrapped
-    if not hasattr(uw, "lander") or uw.lander is None:
-        raise HTTPException(status_code=500, detail="Lander body not initialized")
-
-    x, y, vx, vy, angle, ang_vel, leg_l, leg_r = [float(v) for v in observation]
-
-    # Keep custom starts inside a physically stable range to avoid broken joints/explosions.
-    x = float(np.clip(x, -0.95, 0.95))
-    y = float(np.clip(y, -0.95, 1.25))
-    vx = float(np.clip(vx, -2.0, 2.0))
-    vy = float(np.clip(vy, -2.0, 2.0))
-    angle = float(np.clip(angle, -1.0, 1.0))
-    ang_vel = float(np.clip(ang_vel, -2.0, 2.0))
-
-    # Convert normalized observation space back into Box2D world coordinates.
-    half_w = ll.VIEWPORT_W / ll.SCALE / 2
-    half_h = ll.VIEWPORT_H / ll.SCALE / 2
-
-    pos_x = x * half_w + half_w
-    pos_y = y * half_h + (uw.helipad_y + ll.LEG_DOWN / ll.SCALE)
-    vel_x = vx * ll.FPS / half_w
-    vel_y = vy * ll.FPS / half_h
-    angular_velocity = ang_vel * ll.FPS / 20.0
-
-    uw.lander.position = (pos_x, pos_y)
-    uw.lander.linearVelocity = (vel_x, vel_y)
-    uw.lander.angle = angle
-    uw.lander.angularVelocity = angular_velocity
-
-    # Move legs consistently with the lander transform so joints remain stable.
-    if hasattr(uw, "legs") and len(uw.legs) >= 2:
-        for i, leg in zip([-1, +1], uw.legs):
-            leg.position = (pos_x - i * ll.LEG_AWAY / ll.SCALE, pos_y)
-            leg.linearVelocity = (vel_x, vel_y)
-            leg.angle = angle + (i * 0.05)
-            leg.angularVelocity = angular_velocity
-            leg.awake = True
-
-    uw.lander.awake = True
-
-    if hasattr(uw, "legs") and len(uw.legs) >= 2:
-        # Contact flags are environment outputs; forcing them can produce invalid states.
-        uw.legs[0].ground_contact = False
-        uw.legs[1].ground_contact = False
-
-    return np.array([x, y, vx, vy, angle, ang_vel, leg_l, leg_r], dtype=np.float32)
+    return buf.getvalue()
 
 
 @router.get("")
@@ -125,8 +75,9 @@ def interface_info() -> dict[str, str]:
     }
 
 
+# Frames are raw PNG/GIF bytes: base64 strings in JSON, raw binary with msgpack/npz.
 @router.post("/run")
-def run_episode(req: InterfaceRunRequest) -> dict[str, Any]:
+def run_episode(request: Request, req: InterfaceRunRequest) -> Response:
     model = require_run_model_or_503(req.run)
     env = gym.make("LunarLander-v3", render_mode="rgb_array")
     obs, _ = env.reset(seed=int(req.seed))
@@ -149,35 +100,45 @@ def run_episode(req: InterfaceRunRequest) -> dict[str, Any]:
     env.close()
 
     if not frames:
-        return {
-            "total_reward": total_reward,
-            "steps": steps,
-            "frames": {"start": None, "middle": None, "end": None},
-        }
+        return encode_response(
+            request,
+            {
+                "total_reward": total_reward,
+                "steps": steps,
+                "frames": {"start": None, "middle": None, "end": None},
+            },
+        )
 
     middle_idx = len(frames) // 2
     payload = {
-        "start": _frame_to_base64_png(frames[0]),
-        "middle": _frame_to_base64_png(frames[middle_idx]),
-        "end": _frame_to_base64_png(frames[-1]),
+        "start": _frame_to_png(frames[0]),
+        "middle": _frame_to_png(frames[middle_idx]),
+        "end": _frame_to_png(frames[-1]),
     }
 
-    return {
-        "total_reward": total_reward,
-        "steps": steps,
-        "frames": payload,
-    }
+    return encode_response(
+        request,
+        {
+            "total_reward": total_reward,
+            "steps": steps,
+            "frames": payload,
+        },
+    )
 
 
 @router.post("/launch")
 @router.post("/test-rocket")
-def launch(req: TestRocketRequest) -> dict[str, Any]:
+def launch(request: Request, req: TestRocketRequest) -> Response:
     model = require_run_model_or_503(req.run)
     env = gym.make("LunarLander-v3", render_mode="rgb_array")
     _, _ = env.reset(seed=int(req.seed))
 
     # Start from user-defined state rather than default env reset state.
-    obs = _apply_observation_override(env, req.observation)
+    try:
+        obs = apply_observation_override(env, req.observation)
+    except RuntimeError as exc:
+        env.close()
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
     action, _ = model.predict(obs, deterministic=req.deterministic)
     predicted_action = int(np.asarray(action).reshape(-1)[0])
 
@@ -202,23 +163,30 @@ def launch(req: TestRocketRequest) -> dict[str, Any]:
     env.close()
 
     if not frames:
-        return {
+        return encode_response(
+            request,
+            {
+                "predicted_action": predicted_action,
+                "total_reward": total_reward,
+                "steps": steps,
+                "frames": {"start": None, "middle": None, "end": None},
+                "gif_base64": None,
+            },
+        )
+
+    mid = len(frames) // 2
+    # "gif_base64" keeps its JSON name; with msgpack/npz it holds the raw GIF bytes.
+    return encode_response(
+        request,
+        {
             "predicted_action": predicted_action,
             "total_reward": total_reward,
             "steps": steps,
-            "frames": {"start": None, "middle": None, "end": None},
-            "gif_base64": None,
-        }
-
-    mid = len(frames) // 2
-    return {
-        "predicted_action": predicted_action,
-        "total_reward": total_reward,
-        "steps": steps,
-        "frames": {
-            "start": _frame_to_base64_png(frames[0]),
-            "middle": _frame_to_base64_png(frames[mid]),
-            "end": _frame_to_base64_png(frames[-1]),
+            "frames": {
+                "start": _frame_to_png(frames[0]),
+                "middle": _frame_to_png(frames[mid]),
+                "end": _frame_to_png(frames[-1]),
+            },
+            "gif_base64": _frames_to_gif(frames) if req.include_gif else None,
         },
-        "gif_base64": _frames_to_base64_gif(frames) if req.include_gif else None,
-    }
+    )
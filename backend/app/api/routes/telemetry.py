@@ -1,10 +1,19 @@
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
 
 import numpy as np
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from ...core.encoding import encode_response, files_etag, not_modified
+from ...core.jobs import list_run_results
+from ...core.lander import episode_summary
+from ...core.monitor import load_monitor
 from ...core.runtime import resolve_runs_base_dir
+from ...core.settings import COMPARE_MAX_RUNS, COMPARE_MAX_WORKERS
 
 dashboard_router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 rocket_router = APIRouter(prefix="/rocket", tags=["rocket"])
@@ -32,6 +41,67 @@ def _run_npz_path(base_dir: Path, run: str | None) -> Path:
     return npz_path
 
 
+# One entry per evaluations.npz path: (mtime_ns, size, (timesteps, results)).
+_evaluations_cache: dict[str, tuple[int, int, tuple[np.ndarray, np.ndarray]]] = {}
+_evaluations_lock = threading.Lock()
+
+
+def _read_evaluations(npz_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    with np.load(npz_path, allow_pickle=True) as data:
+        timesteps = np.asarray(data["timesteps"]).reshape(-1)
+        if len(timesteps) == 0:
+            # An EvalCallback that has not evaluated yet; callers report "no timesteps".
+            results = np.empty((0, 0))
+        else:
+            results = np.asarray(data["results"], dtype=np.float64).reshape(len(timesteps), -1)
+    # Cached arrays are shared across requests, so guard them against in-place edits.
+    timesteps.flags.writeable = False
+    results.flags.writeable = False
+    return timesteps, results
+
+
+def _load_npz_evaluations(npz_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Load (timesteps, results) through a per-path cache replaced when the file changes."""
+    stat = npz_path.stat()
+    key = str(npz_path)
+    with _evaluations_lock:
+        cached = _evaluations_cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    # Loaded outside the lock so concurrent /compare loads are not serialized.
+    evaluations = _read_evaluations(npz_path)
+    with _evaluations_lock:
+        _evaluations_cache[key] = (stat.st_mtime_ns, stat.st_size, evaluations)
+    return evaluations
+
+
+def _load_run_evaluations(base_dir: Path, run: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """Load one run's evaluation arrays, or None when the file is missing/unreadable."""
+    try:
+        return _load_npz_evaluations(base_dir / run / "evaluations.npz")
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _rolling_window_bounds(n: int, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return (start, end) prefix-sum indices of a trailing window ending at each element."""
+    end = np.arange(1, n + 1)
+    start = np.maximum(0, end - window)
+    return start, end
+
+
+def _rolling_mean_std(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Trailing rolling mean/std via prefix sums: O(n) regardless of window size."""
+    start, end = _rolling_window_bounds(len(values), window)
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    prefix_sq = np.concatenate(([0.0], np.cumsum(np.square(values))))
+    counts = end - start
+    mean = (prefix[end] - prefix[start]) / counts
+    # Clamp tiny negative variances caused by floating-point cancellation.
+    variance = np.maximum((prefix_sq[end] - prefix_sq[start]) / counts - np.square(mean), 0.0)
+    return mean, np.sqrt(variance)
+
+
 def _find_latest_evaluations_npz(base_dir: Path) -> Path | None:
     direct = base_dir / "evaluations.npz"
     if direct.exists():
@@ -83,21 +153,24 @@ def runs() -> dict[str, Any]:
 
 @dashboard_router.get("/data")
 def dashboard_data(
+    request: Request,
     run: str | None = None,
     min_timestep: int | None = None,
     max_timestep: int | None = None,
     max_points: int | None = Query(default=None, ge=3, le=30),
     smoothing_window: int = Query(default=5, ge=1, le=15),
     success_threshold: float = 200.0,
-) -> dict[str, Any]:
+) -> Response:
     base_dir = resolve_runs_base_dir()
     npz_path = _run_npz_path(base_dir, run)
+    # Run-derived data only changes when the npz is rewritten, so revalidate cheaply.
+    etag = files_etag(request, [npz_path])
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
 
     # SB3 EvalCallback writes timesteps/results arrays in evaluations.npz.
-    data = np.load(npz_path, allow_pickle=True)
-    all_timesteps = data["timesteps"]
+    all_timesteps, results = _load_npz_evaluations(npz_path)
     timesteps = all_timesteps
-    results = data["results"]
 
     if len(all_timesteps) == 0:
         raise HTTPException(status_code=404, detail="No evaluation timesteps found")
@@ -145,24 +218,324 @@ def dashboard_data(
         smoothed_success = success_rate
         smoothed_timesteps = timesteps
 
-    return {
+    payload = {
         "npz_path": _public_runs_path(npz_path),
         "run_min_timestep": run_min_timestep,
         "run_max_timestep": run_max_timestep,
-        "timesteps": timesteps.tolist(),
-        "mean_rewards": mean_rewards.tolist(),
-        "std_rewards": std_rewards.tolist(),
-        "success_rate": success_rate.tolist(),
-        "smoothed_timesteps": smoothed_timesteps.tolist(),
-        "smoothed_mean": smoothed_mean.tolist(),
-        "smoothed_success_rate": smoothed_success.tolist(),
+        "timesteps": timesteps,
+        "mean_rewards": mean_rewards,
+        "std_rewards": std_rewards,
+        "success_rate": success_rate,
+        "smoothed_timesteps": smoothed_timesteps,
+        "smoothed_mean": smoothed_mean,
+        "smoothed_success_rate": smoothed_success,
         "smoothing_window": smoothing_window,
         "points": int(len(timesteps)),
     }
+    return encode_response(request, payload, etag=etag)
+
+
+@dashboard_router.get("/compare")
+def compare_runs(
+    request: Request,
+    runs: list[str] | None = Query(default=None),
+    min_timestep: int | None = None,
+    max_timestep: int | None = None,
+    grid_points: int = Query(default=100, ge=3, le=1000),
+    success_threshold: float = 200.0,
+    min_coverage: float = Query(default=0.0, ge=0.0, le=1.0),
+    include_curves: bool = False,
+) -> Response:
+    base_dir = resolve_runs_base_dir()
+    available = _list_runs(base_dir)
+    if not available:
+        raise HTTPException(status_code=404, detail=f"No run directories found in {base_dir}")
+
+    # Without an explicit selection, compare every run in the run directory.
+    # Only names listed from disk are used, so request values never build paths directly.
+    available_set = set(available)
+    requested = list(dict.fromkeys(runs)) if runs else available
+    selected = [run for run in requested if run in available_set]
+    skipped = [run for run in requested if run not in available_set]
+    if len(selected) > COMPARE_MAX_RUNS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many runs selected ({len(selected)}); limit is {COMPARE_MAX_RUNS}",
+        )
+    if not selected:
+        raise HTTPException(status_code=404, detail="None of the requested runs exist")
+
+    etag = files_etag(request, [base_dir / run / "evaluations.npz" for run in selected])
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+
+    # File loads are I/O bound (zip + decompress), so a bounded thread pool overlaps them.
+    workers = max(1, min(COMPARE_MAX_WORKERS, len(selected)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = list(pool.map(partial(_load_run_evaluations, base_dir), selected))
+
+    names: list[str] = []
+    curves: list[tuple[np.ndarray, np.ndarray]] = []
+    for run, evaluations in zip(selected, loaded):
+        if evaluations is None or len(evaluations[0]) == 0:
+            skipped.append(run)
+            continue
+        names.append(run)
+        curves.append(evaluations)
+
+    if not curves:
+        raise HTTPException(status_code=404, detail="No evaluations.npz found in selected runs")
+
+    # Grid spans the union of run ranges (or the requested window). Runs are never
+    # extrapolated: grid points outside a run's own range are NaN for that run.
+    grid_min = min(float(timesteps.min()) for timesteps, _ in curves)
+    grid_max = max(float(timesteps.max()) for timesteps, _ in curves)
+    if min_timestep is not None:
+        grid_min = max(grid_min, float(min_timestep))
+    if max_timestep is not None:
+        grid_max = min(grid_max, float(max_timestep))
+    if grid_max < grid_min:
+        raise HTTPException(status_code=404, detail="No data points after filtering")
+
+    span = grid_max - grid_min
+    grid = np.linspace(grid_min, grid_max, num=grid_points) if span > 0 else np.array([grid_min])
+    reward_matrix = np.empty((len(curves), len(grid)))
+    success_matrix = np.empty((len(curves), len(grid)))
+    for i, (timesteps, results) in enumerate(curves):
+        # np.interp needs increasing x; SB3 writes sorted timesteps but merged runs may not be.
+        order = np.argsort(timesteps, kind="stable")
+        sorted_timesteps = timesteps[order]
+        reward_matrix[i] = np.interp(
+            grid,
+            sorted_timesteps,
+            results.mean(axis=1)[order],
+            left=np.nan,
+            right=np.nan,
+        )
+        success_matrix[i] = np.interp(
+            grid,
+            sorted_timesteps,
+            np.mean(results > success_threshold, axis=1)[order] * 100,
+            left=np.nan,
+            right=np.nan,
+        )
+
+    covered = ~np.isnan(reward_matrix)
+    # Per-run coverage of the grid span; runs below min_coverage are reported as skipped.
+    if span > 0:
+        segment_covered = covered[:, 1:] & covered[:, :-1]
+        widths = np.diff(grid)
+        covered_span = np.where(segment_covered, widths, 0.0).sum(axis=1)
+        coverage = covered_span / span
+    else:
+        segment_covered = np.zeros((len(curves), 0), dtype=bool)
+        widths = np.zeros(0)
+        covered_span = np.zeros(len(curves))
+        coverage = covered.any(axis=1).astype(np.float64)
+    keep = covered.any(axis=1) & (coverage >= min_coverage)
+    skipped.extend(name for name, kept in zip(names, keep) if not kept)
+    if not keep.any():
+        raise HTTPException(status_code=404, detail="No run covers enough of the timestep range")
+    names = [name for name, kept in zip(names, keep) if kept]
+    reward_matrix = reward_matrix[keep]
+    success_matrix = success_matrix[keep]
+    covered = covered[keep]
+    segment_covered = segment_covered[keep]
+    covered_span = covered_span[keep]
+    coverage = coverage[keep]
+
+    # Cross-run statistics use only the runs that cover each grid point. A spread needs
+    # two samples: where run_counts < 2, std and the CI bounds are NaN (null in JSON).
+    run_counts = covered.sum(axis=0)
+    rewards_filled = np.where(covered, reward_matrix, 0.0)
+    mean_rewards = np.full(len(grid), np.nan)
+    np.divide(rewards_filled.sum(axis=0), run_counts, out=mean_rewards, where=run_counts > 0)
+    squared_dev = np.where(covered, np.square(reward_matrix - mean_rewards), 0.0).sum(axis=0)
+    std_rewards = np.full(len(grid), np.nan)
+    np.divide(squared_dev, run_counts - 1, out=std_rewards, where=run_counts > 1)
+    std_rewards = np.sqrt(std_rewards)
+    # Normal-approximation 95% band on the cross-run mean, with the per-point run count.
+    ci_half_width = np.full(len(grid), np.nan)
+    np.divide(1.96 * std_rewards, np.sqrt(run_counts), out=ci_half_width, where=run_counts > 1)
+    mean_success_rate = np.full(len(grid), np.nan)
+    np.divide(
+        np.where(covered, success_matrix, 0.0).sum(axis=0),
+        run_counts,
+        out=mean_success_rate,
+        where=run_counts > 0,
+    )
+
+    # Trapezoidal area over each run's covered segments, normalized by the covered span
+    # so it reads as the run's mean reward over the part of the grid it reached.
+    if span > 0:
+        segment_area = (reward_matrix[:, 1:] + reward_matrix[:, :-1]) * 0.5 * widths
+        auc = np.where(segment_covered, segment_area, 0.0).sum(axis=1)
+    else:
+        auc = np.zeros(len(names))
+    single_point = np.where(covered, reward_matrix, 0.0).sum(axis=1) / covered.sum(axis=1)
+    auc_mean_reward = np.where(covered_span > 0, auc / np.maximum(covered_span, 1e-12), single_point)
+    order = np.argsort(-auc_mean_reward, kind="stable")
+    # Index of each run's last covered grid point.
+    last_idx = len(grid) - 1 - np.argmax(covered[:, ::-1], axis=1)
+
+    ranking = [
+        {
+            "rank": rank,
+            "run": names[idx],
+            "auc": float(auc[idx]),
+            "auc_mean_reward": float(auc_mean_reward[idx]),
+            "coverage": float(coverage[idx]),
+            "final_timestep": float(grid[last_idx[idx]]),
+            "final_mean_reward": float(reward_matrix[idx, last_idx[idx]]),
+            "final_success_rate": float(success_matrix[idx, last_idx[idx]]),
+        }
+        for rank, idx in enumerate(order, start=1)
+    ]
+
+    payload: dict[str, Any] = {
+        "base_dir": _public_runs_path(base_dir),
+        "runs": names,
+        "skipped": skipped,
+        "grid_min_timestep": grid_min,
+        "grid_max_timestep": grid_max,
+        "timesteps": grid,
+        "mean_rewards": mean_rewards,
+        "std_rewards": std_rewards,
+        "ci_lower": mean_rewards - ci_half_width,
+        "ci_upper": mean_rewards + ci_half_width,
+        "run_counts": run_counts,
+        "mean_success_rate": mean_success_rate,
+        "confidence_level": 0.95,
+        "ranking": ranking,
+        "points": int(len(grid)),
+    }
+    if include_curves:
+        payload["curves"] = {name: reward_matrix[i] for i, name in enumerate(names)}
+    return encode_response(request, payload, etag=etag)
+
+
+@dashboard_router.get("/episodes")
+def dashboard_episodes(
+    request: Request,
+    run: str | None = None,
+    min_episode: int | None = Query(default=None, ge=0),
+    max_episode: int | None = Query(default=None, ge=0),
+    window: int = Query(default=100, ge=1, le=10_000),
+    max_points: int = Query(default=1000, ge=10, le=5000),
+    percentiles: list[float] = Query(default=[5.0, 25.0, 50.0, 75.0, 95.0]),
+    success_threshold: float = 200.0,
+) -> Response:
+    base_dir = resolve_runs_base_dir()
+    runs = _list_runs(base_dir)
+    if not runs:
+        raise HTTPException(status_code=404, detail=f"No run directories found in {base_dir}")
+    if any(not 0.0 <= q <= 100.0 for q in percentiles):
+        raise HTTPException(status_code=422, detail="percentiles must be within [0, 100]")
+
+    # Same fallback as /data: unknown run selects the first available one.
+    selected = run if run in runs else runs[0]
+    run_dir = base_dir / selected
+    etag = files_etag(request, [run_dir / "monitor.csv"])
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    try:
+        monitor = load_monitor(run_dir)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid monitor.csv in run '{selected}': {exc}",
+        ) from exc
+    if monitor is None:
+        raise HTTPException(status_code=404, detail=f"No monitor.csv found in run '{selected}'")
+
+    total_episodes = int(len(monitor["reward"]))
+    # Episode range is inclusive and expressed in 0-based episode indices.
+    start = min_episode if min_episode is not None else 0
+    stop = min(total_episodes, max_episode + 1) if max_episode is not None else total_episodes
+    if start >= stop:
+        raise HTTPException(status_code=404, detail="No episodes after filtering")
+
+    rewards = monitor["reward"][start:stop]
+    lengths = monitor["length"][start:stop]
+    wallclock = monitor["wallclock"][start:stop]
+    # Wallclock is cumulative seconds since t_start; the previous episode end anchors the range.
+    wallclock_origin = float(monitor["wallclock"][start - 1]) if start > 0 else 0.0
+    elapsed = float(wallclock[-1]) - wallclock_origin
+
+    rolling_mean, rolling_std = _rolling_mean_std(rewards, window)
+    window_start, window_end = _rolling_window_bounds(len(rewards), window)
+    anchored_wallclock = np.concatenate(([wallclock_origin], wallclock))
+    window_seconds = anchored_wallclock[window_end] - anchored_wallclock[window_start]
+    # Episodes logged within the same wallclock tick have zero duration; report 0 instead of inf.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rolling_eps = np.where(window_seconds > 0, (window_end - window_start) / window_seconds, 0.0)
+
+    episodes = np.arange(start, stop)
+    if len(episodes) > max_points:
+        # Server-side downsampling after full-resolution rolling statistics.
+        indices = np.linspace(0, len(episodes) - 1, num=max_points, dtype=int)
+    else:
+        indices = slice(None)
+
+    payload = {
+        "run": selected,
+        "total_episodes": total_episodes,
+        "min_episode": start,
+        "max_episode": stop - 1,
+        "window": window,
+        "episodes": episodes[indices],
+        "rewards": rewards[indices],
+        "lengths": lengths[indices],
+        "rolling_mean": rolling_mean[indices],
+        "rolling_std": rolling_std[indices],
+        "rolling_episodes_per_sec": rolling_eps[indices],
+        "wallclock": wallclock[indices],
+        "summary": {
+            **episode_summary(rewards, lengths, success_threshold),
+            "elapsed_seconds": elapsed,
+            "episodes_per_sec": float(len(rewards) / elapsed) if elapsed > 0 else None,
+            "steps_per_sec": float(np.sum(lengths) / elapsed) if elapsed > 0 else None,
+        },
+        "reward_percentiles": {
+            f"p{q:g}": float(value)
+            for q, value in zip(percentiles, np.percentile(rewards, percentiles))
+        },
+        "points": int(len(episodes[indices])),
+    }
+    return encode_response(request, payload, etag=etag)
+
+
+@dashboard_router.get("/jobs")
+def dashboard_jobs(run: str | None = None, success_threshold: float = 200.0) -> dict[str, Any]:
+    base_dir = resolve_runs_base_dir()
+    runs = _list_runs(base_dir)
+    if not runs:
+        raise HTTPException(status_code=404, detail=f"No run directories found in {base_dir}")
+
+    # Same fallback as /data: unknown run selects the first available one.
+    selected = run if run in runs else runs[0]
+    evaluations = []
+    for result_path in list_run_results(base_dir / selected):
+        with np.load(result_path) as data:
+            rewards = data["rewards"]
+            lengths = data["lengths"]
+            kind = str(data["kind"])
+        if len(rewards) == 0:
+            continue
+        evaluations.append(
+            {
+                "job_id": result_path.stem,
+                "kind": kind,
+                "npz_path": _public_runs_path(result_path),
+                **episode_summary(rewards, lengths, success_threshold),
+            }
+        )
+
+    return {"run": selected, "evaluations": evaluations}
 
 
 @rocket_router.get("")
-def rocket_data() -> dict[str, Any]:
+def rocket_data(request: Request) -> Response:
     base_dir = resolve_runs_base_dir()
     npz_path = _find_latest_evaluations_npz(base_dir)
     if npz_path is None:
@@ -170,17 +543,19 @@ def rocket_data() -> dict[str, Any]:
             status_code=404,
             detail=f"No evaluations.npz found in {base_dir}",
         )
+    etag = files_etag(request, [npz_path])
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
 
-    data = np.load(npz_path, allow_pickle=True)
-    timesteps = data["timesteps"]
-    results = data["results"]
+    timesteps, results = _load_npz_evaluations(npz_path)
     mean_rewards = results.mean(axis=1)
     std_rewards = results.std(axis=1)
 
-    return {
+    payload = {
         "npz_path": _public_runs_path(npz_path),
-        "timesteps": timesteps.tolist(),
-        "mean_rewards": mean_rewards.tolist(),
-        "std_rewards": std_rewards.tolist(),
+        "timesteps": timesteps,
+        "mean_rewards": mean_rewards,
+        "std_rewards": std_rewards,
         "count": int(len(mean_rewards)),
     }
+    return encode_response(request, payload, etag=etag)
@@ -0,0 +1,267 @@
+"""Response encoding: content negotiation, ETags and size-thresholded compression.
+
+Array-heavy endpoints build payloads with NumPy arrays and let the client pick
+the body format through the ``Accept`` header:
+
+- ``application/json`` (default): arrays become JSON lists.
+- ``application/msgpack``: arrays become maps ``{"dtype", "shape", "data"}``
+  where ``data`` holds the raw little-endian buffer.
+- ``application/x-npz``: a NumPy ``.npz`` archive; nested keys are joined with
+  ``.`` and non-array values (e.g. lists of records) are stored as JSON strings.
+
+``bytes`` values (encoded PNG/GIF frames) are base64 strings in JSON, raw binary
+in MessagePack and ``uint8`` arrays in ``.npz``.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from .settings import COMPRESSION_MIN_BYTES
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Negotiated responses vary on both format and compression, including 304s.
+NEGOTIATED_VARY = "Accept, Accept-Encoding"
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NPZ_MEDIA_TYPE = "application/x-npz"
+
+# Content types worth compressing. Raw PNG/GIF frames inside msgpack/npz bodies are
+# already compressed, so those bodies shrink much less than array-only payloads.
+_COMPRESSIBLE_PREFIXES = ("application/json", "application/msgpack", "application/x-npz", "text/")
+
+
+def _parse_quality_header(value: str) -> list[tuple[str, float]]:
+    """Parse Accept / Accept-Encoding into (token, q) pairs, highest q first."""
+    entries = []
+    for position, part in enumerate(value.split(",")):
+        token, *params = [item.strip() for item in part.split(";")]
+        if not token:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        # Position breaks ties so the client's own ordering is preserved.
+        entries.append((token.lower(), quality, position))
+    entries.sort(key=lambda entry: (-entry[1], entry[2]))
+    return [(token, quality) for token, quality, _ in entries if quality > 0]
+
+
+def _supported_media_types() -> dict[str, str]:
+    supported = {JSON_MEDIA_TYPE: JSON_MEDIA_TYPE, NPZ_MEDIA_TYPE: NPZ_MEDIA_TYPE}
+    if msgpack is not None:
+        supported[MSGPACK_MEDIA_TYPE] = MSGPACK_MEDIA_TYPE
+        supported["application/x-msgpack"] = MSGPACK_MEDIA_TYPE
+    return supported
+
+
+def negotiate_media_type(request: Request) -> str:
+    """Pick the response media type from Accept, falling back to JSON."""
+    supported = _supported_media_types()
+    for token, _ in _parse_quality_header(request.headers.get("accept", "")):
+        if token in supported:
+            return supported[token]
+        if token in ("*/*", "application/*"):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def files_etag(request: Request, paths: Iterable[Path]) -> str:
+    """Weak ETag derived from file stats, query string and negotiated media type."""
+    digest = hashlib.sha1()
+    digest.update(negotiate_media_type(request).encode())
+    digest.update(request.url.query.encode())
+    for path in paths:
+        try:
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        except OSError:
+            digest.update(f"{path}:missing".encode())
+    # Weak because the byte representation changes with Content-Encoding.
+    return f'W/"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Return a 304 response when If-None-Match already holds the current ETag."""
+    candidates = {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}
+    # Weak comparison: W/"x" and "x" refer to the same representation.
+    normalized = {tag.removeprefix("W/") for tag in candidates}
+    if "*" in candidates or etag.removeprefix("W/") in normalized:
+        return Response(status_code=304, headers={"ETag": etag, "Vary": NEGOTIATED_VARY})
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f" and np.isnan(value).any():
+            # JSON has no NaN; gaps (e.g. runs not covering a grid point) become null.
+            return np.where(np.isnan(value), None, value).tolist()
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        return {"dtype": array.dtype.str, "shape": list(array.shape), "data": array.tobytes()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def _flatten_for_npz(prefix: str, value: Any, out: dict[str, np.ndarray]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten_for_npz(f"{prefix}.{key}" if prefix else str(key), item, out)
+        return
+    if value is None:
+        return
+    if isinstance(value, bytes):
+        out[prefix] = np.frombuffer(value, dtype=np.uint8)
+        return
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        array = None
+    if array is None or array.dtype == object:
+        # Ragged lists and records cannot be loaded without pickle; ship them as JSON.
+        array = np.asarray(json.dumps(value, default=_json_default))
+    out[prefix] = array
+
+
+def serialize_payload(payload: dict[str, Any], media_type: str) -> bytes:
+    """Serialize a payload that may contain NumPy arrays into the given media type."""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+    if media_type == NPZ_MEDIA_TYPE:
+        arrays: dict[str, np.ndarray] = {}
+        _flatten_for_npz("", payload, arrays)
+        buf = io.BytesIO()
+        np.savez(buf, **arrays)
+        return buf.getvalue()
+    return json.dumps(
+        payload,
+        default=_json_default,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def encode_response(request: Request, payload: dict[str, Any], etag: str | None = None) -> Response:
+    """Serialize payload in the negotiated format, reporting CPU time via Server-Timing."""
+    media_type = negotiate_media_type(request)
+    started = time.perf_counter()
+    body = serialize_payload(payload, media_type)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    headers = {
+        "Vary": NEGOTIATED_VARY,
+        "Server-Timing": f"serialize;dur={elapsed_ms:.3f}",
+    }
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _negotiate_encoding(accept_encoding: str) -> str | None:
+    supported = {"gzip"}
+    if brotli is not None:
+        supported.add("br")
+    if zstandard is not None:
+        supported.add("zstd")
+    for token, _ in _parse_quality_header(accept_encoding):
+        if token in supported:
+            return token
+        if token == "*":
+            return "gzip"
+    return None
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compress response bodies above a size threshold with br, zstd or gzip."""
+
+    def __init__(self, app: Any, minimum_size: int = COMPRESSION_MIN_BYTES) -> None:
+        super().__init__(app)
+        self.minimum_size = minimum_size
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        encoding = _negotiate_encoding(request.headers.get("accept-encoding", ""))
+        content_type = response.headers.get("content-type", "")
+        if (
+            encoding is None
+            or "content-encoding" in response.headers
+            or not content_type.startswith(_COMPRESSIBLE_PREFIXES)
+        ):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {
+            key: value for key, value in response.headers.items() if key != "content-length"
+        }
+        if len(body) < self.minimum_size:
+            return Response(content=body, status_code=response.status_code, headers=headers)
+
+        started = time.perf_counter()
+        compressed = _compress(body, encoding)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # Expose raw vs on-the-wire size and compression cost for client-side measurement.
+        server_timing = headers.get("server-timing")
+        compress_timing = f"compress;dur={elapsed_ms:.3f}"
+        headers["server-timing"] = (
+            f"{server_timing}, {compress_timing}" if server_timing else compress_timing
+        )
+        headers["content-encoding"] = encoding
+        headers["x-uncompressed-length"] = str(len(body))
+        vary = headers.get("vary")
+        if not vary:
+            headers["vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["vary"] = f"{vary}, Accept-Encoding"
+        return Response(content=compressed, status_code=response.status_code, headers=headers)
@@ -0,0 +1,382 @@
+"""Persistent batch-evaluation jobs: SQLite-backed queue executed on a process pool."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing, contextmanager
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+
+from .lander import apply_observation_override
+from .rollout import predict_actions
+from .runtime import load_model, resolve_path, resolve_run_model_path, resolve_runs_base_dir
+from .settings import JOB_CHUNK_SIZE, JOB_WORKERS, JOBS_DB_PATH
+
+ENV_ID = "LunarLander-v3"
+RESULTS_DIRNAME = "jobs"
+
+# Set in each worker by the pool initializer; the API process sets it on shutdown.
+_stop_event: Any = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_units (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    run TEXT NOT NULL,
+    status TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    error TEXT,
+    PRIMARY KEY (job_id, run)
+);
+"""
+
+
+@contextmanager
+def _db(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a short-lived connection; API process and workers never share handles."""
+    with closing(sqlite3.connect(db_path, timeout=30.0)) as conn:
+        conn.row_factory = sqlite3.Row
+        with conn:
+            yield conn
+
+
+def job_result_paths(run: str, job_id: str) -> tuple[Path, Path]:
+    """Return (final, partial) result paths stored next to the evaluated run."""
+    results_dir = resolve_runs_base_dir() / run / RESULTS_DIRNAME
+    return results_dir / f"{job_id}.npz", results_dir / f"{job_id}.partial.npz"
+
+
+def _save_npz_atomic(path: Path, **arrays: Any) -> None:
+    """Write an .npz through a temp file so a crash never leaves a truncated checkpoint."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _load_partial(partial_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Load checkpointed episode results, or empty arrays when starting fresh."""
+    if partial_path.exists():
+        with np.load(partial_path) as data:
+            return data["rewards"], data["lengths"]
+    return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64)
+
+
+def evaluate_batch(
+    model: Any,
+    seeds: np.ndarray,
+    observations: np.ndarray | None,
+    max_steps: int,
+    deterministic: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run one episode per seed in a vectorized env and return (rewards, lengths)."""
+    n_envs = len(seeds)
+    envs = gym.vector.SyncVectorEnv([lambda: gym.make(ENV_ID) for _ in range(n_envs)])
+    obs, _ = envs.reset(seed=[int(seed) for seed in seeds])
+    if observations is not None:
+        for i, (env, observation) in enumerate(zip(envs.envs, observations)):
+            obs[i] = apply_observation_override(env, observation.tolist())
+
+    rewards = np.zeros(n_envs, dtype=np.float64)
+    lengths = np.zeros(n_envs, dtype=np.int64)
+    active = np.ones(n_envs, dtype=bool)
+    for _ in range(max_steps):
+        # One compiled, no-grad forward pass for every env instead of one predict per episode.
+        actions = predict_actions(model, obs, deterministic=deterministic)
+        obs, reward, terminated, truncated, _ = envs.step(actions)
+        # Finished envs auto-reset on the next step; only count steps of the first episode.
+        rewards += np.where(active, reward, 0.0)
+        lengths += active
+        active &= ~(terminated | truncated)
+        if not active.any():
+            break
+
+    envs.close()
+    return rewards, lengths
+
+
+def _refresh_job_status(conn: sqlite3.Connection, job_id: str) -> None:
+    """Derive job status from its per-run units.
+
+    A job is running while any unit runs and queued while units only wait; once
+    all units have finished it is completed, or failed when at least one failed.
+    """
+    statuses = {
+        row["status"]
+        for row in conn.execute("SELECT status FROM job_units WHERE job_id = ?", (job_id,))
+    }
+    if "running" in statuses:
+        status = "running"
+    elif "queued" in statuses:
+        status = "queued"
+    elif "failed" in statuses:
+        status = "failed"
+    else:
+        status = "completed"
+    conn.execute(
+        "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+        (status, time.time(), job_id),
+    )
+
+
+def _update_unit(db_path: str, job_id: str, run: str, **fields: Any) -> None:
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _db(db_path) as conn:
+        conn.execute(
+            f"UPDATE job_units SET {assignments} WHERE job_id = ? AND run = ?",
+            (*fields.values(), job_id, run),
+        )
+        _refresh_job_status(conn, job_id)
+
+
+def _execute_unit(db_path: str, job_id: str, run: str) -> None:
+    """Evaluate one run for a job, checkpointing after every chunk of episodes."""
+    with _db(db_path) as conn:
+        row = conn.execute("SELECT kind, spec FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    spec = json.loads(row["spec"])
+    seeds = np.asarray(spec["seeds"], dtype=np.int64)
+    observations = (
+        np.asarray(spec["observations"], dtype=np.float32)
+        if spec["observations"] is not None
+        else None
+    )
+    total = len(seeds)
+
+    result_path, partial_path = job_result_paths(run, job_id)
+    # Resume from the last checkpoint when a previous worker was interrupted.
+    rewards, lengths = _load_partial(partial_path)
+    done = len(rewards)
+    _update_unit(db_path, job_id, run, status="running", done=done, error=None)
+
+    model = load_model(str(resolve_run_model_path(run)))
+    while done < total:
+        # Stop at a chunk boundary on shutdown; the checkpoint lets a restart resume here.
+        if _stop_event is not None and _stop_event.is_set():
+            _update_unit(db_path, job_id, run, status="queued")
+            return
+        stop = min(done + JOB_CHUNK_SIZE, total)
+        chunk_rewards, chunk_lengths = evaluate_batch(
+            model,
+            seeds[done:stop],
+            observations[done:stop] if observations is not None else None,
+            spec["max_steps"],
+            spec["deterministic"],
+        )
+        rewards = np.concatenate([rewards, chunk_rewards])
+        lengths = np.concatenate([lengths, chunk_lengths])
+        done = stop
+        _save_npz_atomic(partial_path, rewards=rewards, lengths=lengths)
+        _update_unit(db_path, job_id, run, done=done)
+
+    arrays: dict[str, Any] = {
+        "job_id": np.asarray(job_id),
+        "kind": np.asarray(row["kind"]),
+        "run": np.asarray(run),
+        "seeds": seeds,
+        "rewards": rewards,
+        "lengths": lengths,
+        "max_steps": np.asarray(spec["max_steps"]),
+        "deterministic": np.asarray(spec["deterministic"]),
+    }
+    if observations is not None:
+        arrays["observations"] = observations
+    _save_npz_atomic(result_path, **arrays)
+    partial_path.unlink(missing_ok=True)
+    _update_unit(db_path, job_id, run, status="completed")
+
+
+def _init_worker(stop_event: Any) -> None:
+    """Pool initializer: keep the shared shutdown signal for _execute_unit."""
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _run_unit(db_path: str, job_id: str, run: str) -> None:
+    """Process-pool entrypoint; failures are recorded on the unit instead of raised."""
+    try:
+        _execute_unit(db_path, job_id, run)
+    except Exception as exc:  # noqa: BLE001 - surfaced through job status
+        _update_unit(db_path, job_id, run, status="failed", error=str(exc))
+
+
+def load_job_result(run: str, job_id: str) -> dict[str, np.ndarray] | None:
+    """Load a finished job result for one run, or None when it is not written yet."""
+    result_path, _ = job_result_paths(run, job_id)
+    if not result_path.exists():
+        return None
+    with np.load(result_path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def list_run_results(run_dir: Path) -> list[Path]:
+    """List finished job result files for a run, newest first."""
+    results_dir = run_dir / RESULTS_DIRNAME
+    if not results_dir.exists():
+        return []
+    return sorted(
+        [p for p in results_dir.glob("*.npz") if not p.name.endswith(".partial.npz")],
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+
+
+class JobManager:
+    """Owns the job database and dispatches per-run units to a process pool."""
+
+    def __init__(self, db_path: Path, max_workers: int) -> None:
+        self.db_path = str(db_path)
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._stop_event: Any = None
+        # Guards executor replacement: done-callbacks run on the pool's manager thread.
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create schema, start workers and requeue units interrupted by a restart."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with _db(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            pending = conn.execute(
+                "SELECT job_id, run FROM job_units WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            conn.execute("UPDATE job_units SET status = 'queued' WHERE status = 'running'")
+
+        # Spawned workers avoid inheriting torch/uvicorn state from a forked server.
+        self._stop_event = mp.get_context("spawn").Event()
+        with self._lock:
+            self._executor = self._new_executor()
+        for row in pending:
+            self._dispatch(row["job_id"], row["run"])
+
+    def shutdown(self) -> None:
+        """Cancel pending units and ask running ones to stop after their current chunk."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self._stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._stop_event,),
+        )
+
+    def _dispatch(self, job_id: str, run: str) -> None:
+        """Submit one unit; a unit that cannot be submitted is marked failed."""
+        with self._lock:
+            executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError("Job manager is not started")
+            future = executor.submit(_run_unit, self.db_path, job_id, run)
+        except (BrokenProcessPool, RuntimeError) as exc:
+            _update_unit(self.db_path, job_id, run, status="failed", error=str(exc))
+            return
+        future.add_done_callback(partial(self._on_unit_done, executor, job_id, run))
+
+    def _on_unit_done(
+        self, executor: ProcessPoolExecutor, job_id: str, run: str, future: Future
+    ) -> None:
+        """Record units lost with their worker and replace a broken pool."""
+        # Cancelled units stay queued and are picked up again by the next start().
+        if future.cancelled() or future.exception() is None:
+            return
+        with self._lock:
+            if self._executor is None:
+                # Shutting down: leave the unit running so start() requeues it.
+                return
+            if self._executor is executor and isinstance(future.exception(), BrokenProcessPool):
+                # A worker died (OOM, native crash): every future of this pool fails with it.
+                self._executor = self._new_executor()
+        _update_unit(
+            self.db_path,
+            job_id,
+            run,
+            status="failed",
+            error=f"Worker process died: {future.exception()}",
+        )
+
+    def submit(self, kind: str, runs: list[str], spec: dict[str, Any]) -> str:
+        """Persist a job with one unit per run, then dispatch the units."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        total = len(spec["seeds"])
+        with _db(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, spec, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(spec), now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_units (job_id, run, status, total) VALUES (?, ?, 'queued', ?)",
+                [(job_id, run, total) for run in runs],
+            )
+        for run in runs:
+            self._dispatch(job_id, run)
+        return job_id
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Return job status with per-run progress, or None for unknown ids."""
+        with _db(self.db_path) as conn:
+            job = conn.execute(
+                "SELECT id, kind, status, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if job is None:
+                return None
+            units = conn.execute(
+                "SELECT run, status, done, total, error FROM job_units "
+                "WHERE job_id = ? ORDER BY run",
+                (job_id,),
+            ).fetchall()
+        done = sum(unit["done"] for unit in units)
+        total = sum(unit["total"] for unit in units)
+        return {
+            **dict(job),
+            "done": done,
+            "total": total,
+            "progress": done / total if total else 0.0,
+            "units": [dict(unit) for unit in units],
+        }
+
+    def list(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Return most recent jobs first."""
+        with _db(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, kind, status, created_at, updated_at FROM jobs "
+                "ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager."""
+    return JobManager(resolve_path(JOBS_DB_PATH), max_workers=JOB_WORKERS)
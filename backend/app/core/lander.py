@@ -0,0 +1,78 @@
+"""LunarLander helpers shared by API routes and batch workers."""
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.envs.box2d import lunar_lander as ll
+
+OBSERVATION_SIZE = 8
+
+
+def check_observation_sizes(observations: list[list[float]]) -> list[list[float]]:
+    """Validate a batch of observation vectors; used by request model validators."""
+    if any(len(observation) != OBSERVATION_SIZE for observation in observations):
+        raise ValueError(f"each observation must contain exactly {OBSERVATION_SIZE} values")
+    return observations
+
+
+def episode_summary(
+    rewards: np.ndarray,
+    lengths: np.ndarray,
+    success_threshold: float,
+) -> dict[str, float | int]:
+    """Aggregate per-episode rewards/lengths into the summary shown by the API."""
+    return {
+        "episodes": int(len(rewards)),
+        "mean_reward": float(np.mean(rewards)),
+        "std_reward": float(np.std(rewards)),
+        "success_rate": float(np.mean(rewards > success_threshold) * 100),
+        "mean_length": float(np.mean(lengths)),
+    }
+
+def apply_observation_override(env: gym.Env, observation: list[float]) -> np.ndarray:
+    """Map normalized LunarLander observation values back to physical lander state."""
+    uw = env.unwrapped
+    if not hasattr(uw, "lander") or uw.lander is None:
+        raise RuntimeError("Lander body not initialized")
+
+    x, y, vx, vy, angle, ang_vel, leg_l, leg_r = [float(v) for v in observation]
+
+    # Keep custom starts inside a physically stable range to avoid broken joints/explosions.
+    x = float(np.clip(x, -0.95, 0.95))
+    y = float(np.clip(y, -0.95, 1.25))
+    vx = float(np.clip(vx, -2.0, 2.0))
+    vy = float(np.clip(vy, -2.0, 2.0))
+    angle = float(np.clip(angle, -1.0, 1.0))
+    ang_vel = float(np.clip(ang_vel, -2.0, 2.0))
+
+    # Convert normalized observation space back into Box2D world coordinates.
+    half_w = ll.VIEWPORT_W / ll.SCALE / 2
+    half_h = ll.VIEWPORT_H / ll.SCALE / 2
+
+    pos_x = x * half_w + half_w
+    pos_y = y * half_h + (uw.helipad_y + ll.LEG_DOWN / ll.SCALE)
+    vel_x = vx * ll.FPS / half_w
+    vel_y = vy * ll.FPS / half_h
+    angular_velocity = ang_vel * ll.FPS / 20.0
+
+    uw.lander.position = (pos_x, pos_y)
+    uw.lander.linearVelocity = (vel_x, vel_y)
+    uw.lander.angle = angle
+    uw.lander.angularVelocity = angular_velocity
+
+    # Move legs consistently with the lander transform so joints remain stable.
+    if hasattr(uw, "legs") and len(uw.legs) >= 2:
+        for i, leg in zip([-1, +1], uw.legs):
+            leg.position = (pos_x - i * ll.LEG_AWAY / ll.SCALE, pos_y)
+            leg.linearVelocity = (vel_x, vel_y)
+            leg.angle = angle + (i * 0.05)
+            leg.angularVelocity = angular_velocity
+            leg.awake = True
+
+    uw.lander.awake = True
+
+    if hasattr(uw, "legs") and len(uw.legs) >= 2:
+        # Contact flags are environment outputs; forcing them can produce invalid states.
+        uw.legs[0].ground_contact = False
+        uw.legs[1].ground_contact = False
+
+    return np.array([x, y, vx, vy, angle, ang_vel, leg_l, leg_r], dtype=np.float32)
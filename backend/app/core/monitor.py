@@ -0,0 +1,166 @@
+"""Monitor.csv ingestion: columnar arrays cached per file and extended incrementally."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+import warnings
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+
+MONITOR_FILENAME = "monitor.csv"
+MONITOR_CACHE_FILENAME = "monitor.npz"
+
+_COLUMNS = ("reward", "length", "wallclock")
+
+# One entry per monitor.csv path, replaced whenever the file changes. The global lock
+# only guards the dicts; parsing holds the per-path lock so other runs are not blocked.
+_cache: dict[str, dict[str, Any]] = {}
+_path_locks: dict[str, threading.Lock] = {}
+_cache_lock = threading.Lock()
+
+
+def _read_header(fh: BinaryIO) -> tuple[bytes, float, tuple[int, int, int]]:
+    """Read the JSON comment line and column header; leaves fh at the first data row."""
+    first_line = fh.readline()
+    t_start = 0.0
+    if first_line.startswith(b"#"):
+        t_start = float(json.loads(first_line[1:]).get("t_start", 0.0))
+        header_line = fh.readline()
+    else:
+        header_line = first_line
+    columns = [name.strip() for name in header_line.decode("utf-8").split(",")]
+    usecols = tuple(columns.index(name) for name in ("r", "l", "t"))
+    # The first line identifies the file: a new run rewrites it with a new t_start.
+    return first_line, t_start, usecols
+
+
+def _parse_rows(chunk: bytes, usecols: tuple[int, int, int]) -> dict[str, np.ndarray]:
+    """Parse complete CSV rows into reward/length/wallclock arrays."""
+    if chunk:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            table = np.loadtxt(
+                io.StringIO(chunk.decode("utf-8")),
+                delimiter=",",
+                usecols=usecols,
+                ndmin=2,
+                dtype=np.float64,
+            )
+    else:
+        table = np.empty((0, 3))
+    table = table.reshape(-1, 3)
+    return {
+        "reward": np.ascontiguousarray(table[:, 0]),
+        "length": table[:, 1].astype(np.int64),
+        "wallclock": np.ascontiguousarray(table[:, 2]),
+    }
+
+
+def _load_disk_cache(cache_path: Path) -> dict[str, Any] | None:
+    """Load the persisted binary copy written by a previous process, if any."""
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path) as data:
+            return {
+                "head": data["head"].item(),
+                "usecols": tuple(int(col) for col in data["usecols"]),
+                "offset": int(data["offset"]),
+                "mtime_ns": int(data["mtime_ns"]),
+                "size": int(data["size"]),
+                "columns": {name: data[name] for name in (*_COLUMNS, "t_start")},
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_disk_cache(cache_path: Path, entry: dict[str, Any]) -> None:
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                head=np.asarray(entry["head"]),
+                usecols=np.asarray(entry["usecols"]),
+                offset=np.asarray(entry["offset"]),
+                mtime_ns=np.asarray(entry["mtime_ns"]),
+                size=np.asarray(entry["size"]),
+                **entry["columns"],
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _refresh(csv_path: Path, entry: dict[str, Any] | None, stat: os.stat_result) -> dict[str, Any]:
+    """Bring a cache entry up to date, parsing only rows appended since its offset."""
+    with open(csv_path, "rb") as fh:
+        head, t_start, usecols = _read_header(fh)
+        data_offset = fh.tell()
+        # Reuse the entry only if it describes a prefix of this same file.
+        appendable = (
+            entry is not None
+            and entry["head"] == head
+            and entry["usecols"] == usecols
+            and entry["offset"] <= stat.st_size
+        )
+        start = entry["offset"] if appendable else data_offset
+        fh.seek(start)
+        tail = fh.read()
+
+    # Only complete lines are consumed; a row still being written is picked up next time.
+    complete = tail[: tail.rfind(b"\n") + 1]
+    new_rows = _parse_rows(complete, usecols)
+    if appendable:
+        columns = {
+            name: np.concatenate([entry["columns"][name], new_rows[name]]) for name in _COLUMNS
+        }
+    else:
+        columns = new_rows
+    columns["t_start"] = np.asarray(t_start)
+    for array in columns.values():
+        # Cached arrays are shared across requests, so guard them against in-place edits.
+        array.flags.writeable = False
+
+    return {
+        "head": head,
+        "usecols": usecols,
+        "offset": start + len(complete),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "columns": columns,
+        "full_parse": not appendable,
+    }
+
+
+def load_monitor(run_dir: Path) -> dict[str, np.ndarray] | None:
+    """Return reward/length/wallclock arrays for a run, or None without monitor.csv."""
+    csv_path = run_dir / MONITOR_FILENAME
+    key = str(csv_path)
+    cache_path = csv_path.with_name(MONITOR_CACHE_FILENAME)
+    with _cache_lock:
+        path_lock = _path_locks.setdefault(key, threading.Lock())
+    with path_lock:
+        # Stat under the path lock so the entry is never compared against an older stat.
+        try:
+            stat = csv_path.stat()
+        except FileNotFoundError:
+            return None
+        with _cache_lock:
+            entry = _cache.get(key)
+        if entry is None:
+            entry = _load_disk_cache(cache_path)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = _refresh(csv_path, entry, stat)
+            # Persist after full parses only: appends during training would otherwise
+            # rewrite the whole binary copy on every poll; a restart re-parses just the tail.
+            if entry.pop("full_parse"):
+                _write_disk_cache(cache_path, entry)
+        with _cache_lock:
+            _cache[key] = entry
+    return entry["columns"]
@@ -0,0 +1,137 @@
+"""Fast-forward rollout engine: unwrapped env stepping with a compiled no-grad policy."""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import torch
+from stable_baselines3 import PPO
+
+ENV_ID = "LunarLander-v3"
+
+
+class _ActionProbabilities(torch.nn.Module):
+    """Actor path of an SB3 discrete ActorCriticPolicy, ending in action probabilities."""
+
+    def __init__(self, model: PPO) -> None:
+        super().__init__()
+        policy = model.policy
+        self.features_extractor = policy.pi_features_extractor
+        self.mlp_extractor = policy.mlp_extractor
+        self.action_net = policy.action_net
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        features = self.features_extractor(obs)
+        logits = self.action_net(self.mlp_extractor.forward_actor(features))
+        # Same normalization as torch Categorical(logits=...), so argmax ties break identically
+        # to SB3's deterministic mode.
+        logits = logits - logits.logsumexp(dim=-1, keepdim=True)
+        return torch.softmax(logits, dim=-1)
+
+
+@lru_cache(maxsize=32)
+def compile_policy(model: PPO) -> torch.jit.ScriptModule:
+    """Trace and freeze the actor path once per loaded model.
+
+    ``torch.jit.trace`` and ``torch.jit.freeze`` are deprecated in recent torch
+    releases and emit a FutureWarning (once per model, thanks to the cache).
+    TorchScript still works there, so torch is left unpinned. The replacement
+    is ``torch.export.export`` on the same ``_ActionProbabilities`` module
+    (``torch.compile`` adds too much warm-up for single-observation steps);
+    ``tests/test_rollout.py`` pins the behaviour that migration has to keep.
+    """
+    model.policy.set_training_mode(False)
+    obs_dim = int(np.prod(model.observation_space.shape))
+    example = torch.zeros((1, obs_dim), dtype=torch.float32, device=model.device)
+    with torch.no_grad():
+        traced = torch.jit.trace(_ActionProbabilities(model).eval(), example)
+    # Freezing inlines weights as constants and lets TorchScript fold the graph.
+    return torch.jit.freeze(traced.eval())
+
+
+def predict_actions(model: PPO, observations: np.ndarray, deterministic: bool = True) -> np.ndarray:
+    """Batched action selection through the compiled policy (SB3 predict equivalent)."""
+    policy = compile_policy(model)
+    with torch.no_grad():
+        obs = torch.as_tensor(observations, dtype=torch.float32, device=model.device)
+        probs = policy(obs.reshape(len(observations), -1))
+        if deterministic:
+            actions = probs.argmax(dim=-1)
+        else:
+            actions = torch.multinomial(probs, 1, True).reshape(-1)
+    return actions.cpu().numpy()
+
+
+class FastRollout:
+    """Headless single-episode runner bypassing gymnasium wrappers and SB3 predict.
+
+    The raw LunarLander env is stepped directly (no PassiveEnvChecker, OrderEnforcing
+    or TimeLimit); the time limit is enforced here instead. Observations are copied
+    into a preallocated buffer that the compiled policy reads in place.
+    """
+
+    def __init__(self, model: PPO) -> None:
+        self.policy = compile_policy(model)
+        env = gym.make(ENV_ID)
+        self.max_episode_steps = env.spec.max_episode_steps if env.spec else None
+        self.env = env.unwrapped
+
+        obs_dim = int(np.prod(model.observation_space.shape))
+        self._obs = np.zeros((1, obs_dim), dtype=np.float32)
+        self._action = torch.zeros(1, dtype=torch.int64, device=model.device)
+        # On CPU the policy input shares memory with the NumPy buffer: no per-step copy.
+        self._obs_host = torch.from_numpy(self._obs)
+        if model.device.type == "cpu":
+            self._obs_tensor = self._obs_host
+        else:
+            self._obs_tensor = torch.zeros((1, obs_dim), dtype=torch.float32, device=model.device)
+
+    def _select_action(self, deterministic: bool) -> int:
+        if self._obs_tensor is not self._obs_host:
+            self._obs_tensor.copy_(self._obs_host)
+        probs = self.policy(self._obs_tensor)
+        if deterministic:
+            torch.argmax(probs, dim=-1, out=self._action)
+        else:
+            self._action.copy_(torch.multinomial(probs, 1, True).reshape(-1))
+        return int(self._action.item())
+
+    def run(self, seed: int | None, max_steps: int, deterministic: bool = True) -> dict[str, Any]:
+        """Play one episode and report reward, length and throughput."""
+        limit = max_steps
+        if self.max_episode_steps is not None:
+            limit = min(limit, self.max_episode_steps)
+
+        started = time.perf_counter()
+        obs, _ = self.env.reset(seed=seed)
+        self._obs[0] = obs
+        total_reward = 0.0
+        steps = 0
+        terminated = truncated = False
+
+        with torch.no_grad():
+            while steps < limit:
+                action = self._select_action(deterministic)
+                obs, reward, terminated, truncated, _ = self.env.step(action)
+                self._obs[0] = obs
+                total_reward += float(reward)
+                steps += 1
+                if terminated or truncated:
+                    break
+
+        elapsed = time.perf_counter() - started
+        return {
+            "total_reward": total_reward,
+            "steps": steps,
+            "terminated": bool(terminated),
+            "truncated": bool(truncated) or (not terminated and steps >= limit),
+            "elapsed_seconds": elapsed,
+            "steps_per_sec": steps / elapsed if elapsed > 0 else None,
+        }
+
+    def close(self) -> None:
+        self.env.close()
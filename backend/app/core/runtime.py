@@ -25,11 +25,11 @@ def resolve_path(path_str: str) -> Path:
 @lru_cache(maxsize=1)
 def get_model() -> PPO:
     """Load and cache the PPO policy used by API endpoints."""
-    return _load_model(str(resolve_path(MODEL_PATH)))
+    return load_model(str(resolve_path(MODEL_PATH)))
 
 
 @lru_cache(maxsize=32)
-def _load_model(model_path: str) -> PPO:
+def load_model(model_path: str) -> PPO:
     """Load and cache a PPO model from a concrete filesystem path."""
     path = Path(model_path)
     if not path.exists():
@@ -39,7 +39,7 @@ def _load_model(model_path: str) -> PPO:
     return PPO.load(str(path))
 
 
-def _resolve_run_model_path(run: str | None) -> Path:
+def resolve_run_model_path(run: str | None) -> Path:
     """Resolve the model path for a selected run or canonical default model."""
     if not run:
         return resolve_path(MODEL_PATH)
@@ -59,9 +59,9 @@ def _resolve_run_model_path(run: str | None) -> Path:
 def require_run_model_or_503(run: str | None) -> PPO:
     """Load selected run model (or default model) and expose user-friendly 503 on failure."""
     try:
-        path = _resolve_run_model_path(run)
+        path = resolve_run_model_path(run)
         # Cached by model path, so switching run keeps each model loaded once per process.
-        return _load_model(str(path))
+        return load_model(str(path))
     except FileNotFoundError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
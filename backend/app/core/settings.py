@@ -11,6 +11,19 @@ DEFAULT_RUNS_BASE_DIR = "backend/runs/lander_baseline"
 MODEL_PATH = getenv("MODEL_PATH", DEFAULT_MODEL_PATH)
 RUNS_BASE_DIR = getenv("RUNS_BASE_DIR", DEFAULT_RUNS_BASE_DIR)
 
+# Multi-run comparison: bounded thread pool for concurrent evaluations.npz loads.
+COMPARE_MAX_WORKERS = int(getenv("COMPARE_MAX_WORKERS", "8"))
+COMPARE_MAX_RUNS = int(getenv("COMPARE_MAX_RUNS", "500"))
+
+# Batch evaluation jobs: queue database, worker processes and episodes per checkpoint.
+DEFAULT_JOBS_DB_PATH = "backend/runs/jobs.sqlite3"
+JOBS_DB_PATH = getenv("JOBS_DB_PATH", DEFAULT_JOBS_DB_PATH)
+JOB_WORKERS = int(getenv("JOB_WORKERS", "2"))
+JOB_CHUNK_SIZE = int(getenv("JOB_CHUNK_SIZE", "50"))
+
+# Responses smaller than this are sent uncompressed (bytes).
+COMPRESSION_MIN_BYTES = int(getenv("COMPRESSION_MIN_BYTES", "1024"))
+
 # Comma-separated list in CORS_ORIGINS env var.
 CORS_ORIGINS = [
     origin.strip()
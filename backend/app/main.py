@@ -1,10 +1,25 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.router import api_router
+from .core.encoding import CompressionMiddleware
+from .core.jobs import get_job_manager
 from .core.settings import APP_TITLE, APP_VERSION, CORS_ORIGINS
 
-app = FastAPI(title=APP_TITLE, version=APP_VERSION)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Job workers start with the API so queued/interrupted jobs resume after restarts.
+    job_manager = get_job_manager()
+    job_manager.start()
+    yield
+    job_manager.shutdown()
+
+
+app = FastAPI(title=APP_TITLE, version=APP_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,7 +27,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the dashboard read cache validators and payload size/timing measurements.
+    expose_headers=["ETag", "Server-Timing", "X-Uncompressed-Length"],
 )
+app.add_middleware(CompressionMiddleware)
 
 
 @app.get("/")
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+# settings.py reads CORS_ORIGINS at import time and has no default for it.
+os.environ.setdefault("CORS_ORIGINS", "http://localhost")
+
+
+@pytest.fixture
+def runs_dir(tmp_path, monkeypatch):
+    """Empty run directory that the dashboard routes resolve as their base dir."""
+    from backend.app.api.routes import telemetry
+
+    base_dir = tmp_path / "runs"
+    base_dir.mkdir()
+    monkeypatch.setattr(telemetry, "resolve_runs_base_dir", lambda: base_dir)
+    return base_dir
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    # Not entered as a context manager: the lifespan would start job workers.
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def model():
+    """Untrained LunarLander PPO policy; enough for checks that only need fixed weights."""
+    gym = pytest.importorskip("gymnasium")
+    sb3 = pytest.importorskip("stable_baselines3")
+
+    return sb3.PPO("MlpPolicy", gym.make("LunarLander-v3"), seed=0, device="cpu")
@@ -0,0 +1,132 @@
+"""Content negotiation, ETag revalidation and compression of API responses."""
+
+import io
+
+import numpy as np
+import pytest
+
+from backend.app.api.routes import simulation
+from backend.app.core.encoding import NEGOTIATED_VARY
+
+msgpack = pytest.importorskip("msgpack")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def vary_tokens(response):
+    return {token.strip().lower() for token in response.headers["vary"].split(",")}
+
+
+def assert_negotiated_vary(response):
+    # CORS middleware appends Origin; the negotiated tokens must always be present.
+    assert vary_tokens(response) >= {token.lower() for token in NEGOTIATED_VARY.split(", ")}
+
+
+def write_evaluations(run_dir, n_points):
+    run_dir.mkdir(parents=True, exist_ok=True)
+    timesteps = np.arange(1, n_points + 1) * 1000
+    results = np.linspace(-100.0, 250.0, n_points * 5).reshape(n_points, 5)
+    np.savez(run_dir / "evaluations.npz", timesteps=timesteps, results=results)
+
+
+@pytest.fixture
+def small_run(runs_dir):
+    write_evaluations(runs_dir / "run-a", 3)
+    return runs_dir
+
+
+@pytest.mark.parametrize(
+    ("accept", "media_type"),
+    [
+        (None, "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/x-npz;q=0.9, application/msgpack;q=0.5", "application/x-npz"),
+        ("text/html, */*;q=0.1", "application/json"),
+        ("application/msgpack;q=0, application/json;q=0.2", "application/json"),
+    ],
+)
+def test_accept_header_selects_media_type(client, small_run, accept, media_type):
+    headers = {"Accept": accept} if accept else {}
+    response = client.get("/dashboard/data", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+    assert_negotiated_vary(response)
+
+
+def test_binary_encodings_carry_the_same_arrays(client, small_run):
+    expected = client.get("/dashboard/data").json()["mean_rewards"]
+
+    response = client.get("/dashboard/data", headers={"Accept": "application/msgpack"})
+    packed = msgpack.unpackb(response.content)["mean_rewards"]
+    assert np.frombuffer(packed["data"], dtype=packed["dtype"]).tolist() == expected
+
+    response = client.get("/dashboard/data", headers={"Accept": "application/x-npz"})
+    with np.load(io.BytesIO(response.content)) as data:
+        assert data["mean_rewards"].tolist() == expected
+
+
+def test_etag_revalidation_returns_304_with_same_vary(client, small_run):
+    first = client.get("/dashboard/data")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    revalidated = client.get("/dashboard/data", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.headers["vary"] == first.headers["vary"]
+    assert_negotiated_vary(revalidated)
+
+    # The representation differs per media type, so the validator must too.
+    other = client.get(
+        "/dashboard/data",
+        headers={"If-None-Match": etag, "Accept": "application/msgpack"},
+    )
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+
+def test_etag_changes_when_the_file_changes(client, small_run):
+    etag = client.get("/dashboard/data").headers["etag"]
+    write_evaluations(small_run / "run-a", 4)
+    response = client.get("/dashboard/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["points"] == 4
+
+
+def test_compression_applies_above_threshold_only(client, runs_dir):
+    write_evaluations(runs_dir / "small", 3)
+    write_evaluations(runs_dir / "large", 300)
+
+    gzip_only = {"Accept-Encoding": "gzip"}
+    small = client.get("/dashboard/data", params={"run": "small"}, headers=gzip_only)
+    assert "content-encoding" not in small.headers
+
+    large = client.get("/dashboard/data", params={"run": "large"}, headers=gzip_only)
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["x-uncompressed-length"]) == len(large.content)
+    assert "compress;dur=" in large.headers["server-timing"]
+    assert_negotiated_vary(large)
+
+    identity = client.get(
+        "/dashboard/data", params={"run": "large"}, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in identity.headers
+
+
+def test_launch_frames_are_raw_bytes_in_msgpack(client, model, monkeypatch):
+    monkeypatch.setattr(simulation, "require_run_model_or_503", lambda run: model)
+    request = {"observation": [0.0, 1.4, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], "max_steps": 100}
+
+    as_json = client.post("/interface/launch", json=request).json()
+    assert isinstance(as_json["frames"]["start"], str)
+
+    request["include_gif"] = True
+    response = client.post(
+        "/interface/launch", json=request, headers={"Accept": "application/msgpack"}
+    )
+    body = msgpack.unpackb(response.content)
+    assert body["frames"]["start"].startswith(PNG_SIGNATURE)
+    assert body["gif_base64"].startswith(b"GIF89a")
+    # No base64 expansion: the binary body is smaller than the same frames as JSON text.
+    assert len(response.content) < len(client.post("/interface/launch", json=request).content)
@@ -0,0 +1,66 @@
+"""Job queue bookkeeping and recovery from dead worker processes."""
+
+import os
+import time
+
+import pytest
+
+from backend.app.core import jobs
+
+
+def crash_unit(db_path, job_id, run):
+    # Stands in for a worker killed by the OOM killer or a native crash.
+    os._exit(1)
+
+
+def complete_unit(db_path, job_id, run):
+    jobs._update_unit(db_path, job_id, run, status="completed")
+
+
+def wait_for_status(manager, job_id, status, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.1)
+    pytest.fail(f"job {job_id} is {manager.get(job_id)['status']}, expected {status}")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = jobs.JobManager(tmp_path / "jobs.sqlite3", max_workers=1)
+    manager.start()
+    yield manager
+    manager.shutdown()
+
+
+def test_status_of_failed_and_waiting_units_is_queued(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_dispatch", lambda job_id, run: None)
+    job_id = manager.submit("seeds", ["run-a", "run-b"], {"seeds": [0]})
+    jobs._update_unit(manager.db_path, job_id, "run-a", status="failed")
+    jobs._update_unit(manager.db_path, job_id, "run-b", status="queued")
+    assert manager.get(job_id)["status"] == "queued"
+
+    jobs._update_unit(manager.db_path, job_id, "run-b", status="running")
+    assert manager.get(job_id)["status"] == "running"
+
+
+def test_dead_worker_fails_unit_and_pool_is_rebuilt(manager, monkeypatch):
+    monkeypatch.setattr(jobs, "_run_unit", crash_unit)
+    crashed = manager.submit("seeds", ["run-a"], {"seeds": [0]})
+    job = wait_for_status(manager, crashed, "failed")
+    assert job["units"][0]["status"] == "failed"
+    assert "Worker process died" in job["units"][0]["error"]
+
+    monkeypatch.setattr(jobs, "_run_unit", complete_unit)
+    recovered = manager.submit("seeds", ["run-a"], {"seeds": [0]})
+    wait_for_status(manager, recovered, "completed")
+
+
+def test_dispatch_failure_marks_unit_failed(manager):
+    manager.shutdown()
+    job_id = manager.submit("seeds", ["run-a"], {"seeds": [0]})
+    job = manager.get(job_id)
+    assert job["status"] == "failed"
+    assert job["units"][0]["error"] == "Job manager is not started"
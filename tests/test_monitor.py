@@ -0,0 +1,134 @@
+"""Incremental monitor.csv ingestion and its per-path cache."""
+
+import threading
+
+import pytest
+
+from backend.app.core import monitor
+
+HEADER = '#{"t_start": 1700000000.0, "env_id": "LunarLander-v3"}\nr,l,t\n'
+
+
+def write_monitor(run_dir, rows, header=HEADER, mode="w"):
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / monitor.MONITOR_FILENAME, mode) as fh:
+        if mode == "w":
+            fh.write(header)
+        fh.write("".join(f"{r},{l},{t}\n" for r, l, t in rows))
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    monitor._cache.clear()
+    yield
+    monitor._cache.clear()
+
+
+def test_parse_of_one_run_does_not_block_another(tmp_path, monkeypatch):
+    slow_dir, fast_dir = tmp_path / "slow", tmp_path / "fast"
+    write_monitor(slow_dir, [(1.0, 10, 0.5)])
+    write_monitor(fast_dir, [(2.0, 20, 1.0)])
+
+    refresh = monitor._refresh
+    parsing, release = threading.Event(), threading.Event()
+
+    def blocking_refresh(csv_path, entry, stat):
+        if csv_path.parent == slow_dir:
+            parsing.set()
+            release.wait(30)
+        return refresh(csv_path, entry, stat)
+
+    monkeypatch.setattr(monitor, "_refresh", blocking_refresh)
+    slow = threading.Thread(target=monitor.load_monitor, args=(slow_dir,))
+    slow.start()
+    try:
+        assert parsing.wait(10)
+        loaded = {}
+        fast = threading.Thread(
+            target=lambda: loaded.update(monitor.load_monitor(fast_dir)), daemon=True
+        )
+        fast.start()
+        fast.join(5)
+        assert not fast.is_alive(), "load_monitor waited for another run's parse"
+        assert loaded["reward"].tolist() == [2.0]
+    finally:
+        release.set()
+        slow.join()
+
+
+@pytest.fixture
+def parsed_chunks(monkeypatch):
+    """Record the number of rows handed to the CSV parser on each refresh."""
+    chunks = []
+    parse_rows = monitor._parse_rows
+
+    def recording_parse_rows(chunk, usecols):
+        chunks.append(chunk.count(b"\n"))
+        return parse_rows(chunk, usecols)
+
+    monkeypatch.setattr(monitor, "_parse_rows", recording_parse_rows)
+    return chunks
+
+
+def test_append_parses_only_new_rows(tmp_path, parsed_chunks):
+    write_monitor(tmp_path, [(1.0, 10, 0.5), (2.0, 20, 1.0)])
+    assert monitor.load_monitor(tmp_path)["reward"].tolist() == [1.0, 2.0]
+
+    write_monitor(tmp_path, [(3.0, 30, 1.5)], mode="a")
+    columns = monitor.load_monitor(tmp_path)
+    assert columns["reward"].tolist() == [1.0, 2.0, 3.0]
+    assert columns["length"].tolist() == [10, 20, 30]
+    assert columns["wallclock"].tolist() == [0.5, 1.0, 1.5]
+    assert float(columns["t_start"]) == 1700000000.0
+    assert parsed_chunks == [2, 1]
+
+
+def test_partial_trailing_line_is_picked_up_once_complete(tmp_path):
+    write_monitor(tmp_path, [(1.0, 10, 0.5)])
+    with open(tmp_path / monitor.MONITOR_FILENAME, "a") as fh:
+        fh.write("2.0,2")
+    assert monitor.load_monitor(tmp_path)["reward"].tolist() == [1.0]
+
+    with open(tmp_path / monitor.MONITOR_FILENAME, "a") as fh:
+        fh.write("0,1.0\n")
+    columns = monitor.load_monitor(tmp_path)
+    assert columns["reward"].tolist() == [1.0, 2.0]
+    assert columns["length"].tolist() == [10, 20]
+
+
+def test_rewrite_with_new_header_is_parsed_from_scratch(tmp_path, parsed_chunks):
+    write_monitor(tmp_path, [(1.0, 10, 0.5)])
+    monitor.load_monitor(tmp_path)
+
+    # A new training run rewrites the file with a new t_start, and it grows past the old one.
+    new_header = HEADER.replace("1700000000.0", "1800000000.0")
+    write_monitor(tmp_path, [(5.0, 50, 0.1), (6.0, 60, 0.2)], header=new_header)
+    columns = monitor.load_monitor(tmp_path)
+    assert columns["reward"].tolist() == [5.0, 6.0]
+    assert float(columns["t_start"]) == 1800000000.0
+    assert parsed_chunks == [1, 2]
+
+
+def test_shrunk_file_is_parsed_from_scratch(tmp_path):
+    write_monitor(tmp_path, [(1.0, 10, 0.5), (2.0, 20, 1.0), (3.0, 30, 1.5)])
+    monitor.load_monitor(tmp_path)
+
+    write_monitor(tmp_path, [(7.0, 70, 0.5)])
+    assert monitor.load_monitor(tmp_path)["reward"].tolist() == [7.0]
+
+
+def test_restart_resumes_from_disk_cache(tmp_path, parsed_chunks):
+    write_monitor(tmp_path, [(1.0, 10, 0.5), (2.0, 20, 1.0)])
+    monitor.load_monitor(tmp_path)
+    assert (tmp_path / monitor.MONITOR_CACHE_FILENAME).exists()
+
+    write_monitor(tmp_path, [(3.0, 30, 1.5)], mode="a")
+    # A new process starts with an empty in-memory cache.
+    monitor._cache.clear()
+    assert monitor.load_monitor(tmp_path)["reward"].tolist() == [1.0, 2.0, 3.0]
+    assert parsed_chunks == [2, 1]
+
+    # Appends do not rewrite the disk cache, so each restart re-parses only the tail.
+    monitor._cache.clear()
+    assert monitor.load_monitor(tmp_path)["reward"].tolist() == [1.0, 2.0, 3.0]
+    assert parsed_chunks == [2, 1, 1]
@@ -0,0 +1,51 @@
+"""Parity of the fast-forward rollout engine with the SB3 predict loop."""
+
+import numpy as np
+import pytest
+
+gym = pytest.importorskip("gymnasium")
+pytest.importorskip("torch")
+pytest.importorskip("stable_baselines3")
+
+from backend.app.core.rollout import ENV_ID, FastRollout, predict_actions  # noqa: E402
+
+SEEDS = range(20)
+MAX_STEPS = 1000
+
+
+def _reference_rollout(model, seed: int) -> tuple[float, int]:
+    """The /api/rollout gym engine: wrapped env stepped with model.predict."""
+    env = gym.make(ENV_ID)
+    try:
+        obs, _ = env.reset(seed=seed)
+        total_reward = 0.0
+        steps = 0
+        while steps < MAX_STEPS:
+            action, _ = model.predict(obs, deterministic=True)
+            obs, reward, terminated, truncated, _ = env.step(int(action))
+            total_reward += float(reward)
+            steps += 1
+            if terminated or truncated:
+                break
+    finally:
+        env.close()
+    return total_reward, steps
+
+
+def test_fast_rollout_matches_predict_loop(model):
+    engine = FastRollout(model)
+    try:
+        for seed in SEEDS:
+            expected_reward, expected_steps = _reference_rollout(model, seed)
+            result = engine.run(seed, MAX_STEPS, deterministic=True)
+            assert result["steps"] == expected_steps, f"seed {seed}"
+            assert result["total_reward"] == expected_reward, f"seed {seed}"
+    finally:
+        engine.close()
+
+
+def test_predict_actions_matches_predict(model):
+    rng = np.random.default_rng(0)
+    observations = rng.normal(size=(500, 8)).astype(np.float32)
+    expected, _ = model.predict(observations, deterministic=True)
+    np.testing.assert_array_equal(predict_actions(model, observations), expected)
@@ -0,0 +1,80 @@
+"""Dashboard endpoints backed by SB3 evaluations.npz files."""
+
+import numpy as np
+import pytest
+
+
+def write_evaluations(run_dir, timesteps, results):
+    run_dir.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        run_dir / "evaluations.npz",
+        timesteps=np.asarray(timesteps),
+        results=np.asarray(results),
+    )
+
+
+@pytest.fixture
+def overlapping_runs(runs_dir):
+    # run-a covers [0, 100]; run-b starts late and only covers [50, 100].
+    write_evaluations(runs_dir / "run-a", [0, 50, 100], [[0.0, 0.0], [10.0, 10.0], [20.0, 20.0]])
+    write_evaluations(runs_dir / "run-b", [50, 100], [[30.0, 30.0], [40.0, 40.0]])
+    return runs_dir
+
+
+def test_empty_evaluations_return_404(client, runs_dir):
+    write_evaluations(runs_dir / "run-a", np.empty(0, dtype=np.int64), np.empty((0,)))
+
+    response = client.get("/dashboard/data", params={"run": "run-a"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No evaluation timesteps found"
+
+    response = client.get("/rocket")
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+def test_compare_spread_is_null_where_one_run_covers(client, overlapping_runs):
+    body = client.get("/dashboard/compare", params={"grid_points": 3}).json()
+    assert body["timesteps"] == [0.0, 50.0, 100.0]
+    assert body["run_counts"] == [1, 2, 2]
+    assert body["mean_rewards"] == [0.0, 20.0, 30.0]
+    assert body["std_rewards"][0] is None
+    assert body["ci_lower"][0] is None and body["ci_upper"][0] is None
+    assert body["std_rewards"][1:] == [np.sqrt(200.0)] * 2
+
+
+def test_compare_grid_spans_union_without_extrapolation(client, overlapping_runs):
+    params = {"grid_points": 3, "include_curves": True}
+    body = client.get("/dashboard/compare", params=params).json()
+    assert body["runs"] == ["run-a", "run-b"]
+    assert (body["grid_min_timestep"], body["grid_max_timestep"]) == (0.0, 100.0)
+    # NaN outside a run's own range is serialized as null.
+    assert body["curves"] == {"run-a": [0.0, 10.0, 20.0], "run-b": [None, 30.0, 40.0]}
+
+
+def test_compare_ranks_by_auc_over_covered_span(client, overlapping_runs):
+    body = client.get("/dashboard/compare", params={"grid_points": 3}).json()
+    ranking = {entry["run"]: entry for entry in body["ranking"]}
+    assert [entry["run"] for entry in body["ranking"]] == ["run-b", "run-a"]
+    assert ranking["run-a"]["coverage"] == 1.0
+    assert ranking["run-a"]["auc"] == 1000.0
+    assert ranking["run-a"]["auc_mean_reward"] == 10.0
+    assert ranking["run-b"]["coverage"] == 0.5
+    assert ranking["run-b"]["auc"] == 1750.0
+    assert ranking["run-b"]["auc_mean_reward"] == 35.0
+    assert ranking["run-b"]["final_timestep"] == 100.0
+
+
+def test_compare_min_coverage_skips_partial_runs(client, overlapping_runs):
+    params = {"grid_points": 3, "min_coverage": 0.6, "runs": ["run-a", "run-b", "missing"]}
+    body = client.get("/dashboard/compare", params=params).json()
+    assert body["runs"] == ["run-a"]
+    assert body["skipped"] == ["missing", "run-b"]
+    assert body["run_counts"] == [1, 1, 1]
+
+
+def test_compare_window_collapses_to_single_point(client, overlapping_runs):
+    params = {"min_timestep": 50, "max_timestep": 50}
+    body = client.get("/dashboard/compare", params=params).json()
+    assert body["timesteps"] == [50.0]
+    assert body["mean_rewards"] == [20.0]